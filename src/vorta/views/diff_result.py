@@ -1,10 +1,8 @@
 import enum
-import json
 import logging
 import re
-from dataclasses import dataclass
-from pathlib import PurePath
-from typing import List, Optional, Tuple
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 from PyQt6 import uic
 from PyQt6.QtCore import (
@@ -26,11 +24,18 @@
     FileSystemItem,
     FileTreeModel,
     FileTreeSortProxyModel,
+    Path,
     path_to_str,
     relative_path,
+    str_to_path,
 )
 from vorta.views.utils import get_colored_icon
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 uifile = get_asset('UI/diffresult.ui')
 DiffResultUI, DiffResultBase = uic.loadUiType(uifile)
 
@@ -57,12 +62,11 @@ def run(self) -> None:
             if isinstance(self.fs_data, dict):
                 lines = [self.fs_data]
             else:
-                lines = [json.loads(line) for line in self.fs_data.split('\n') if line]
+                lines = iter_json_lines(self.fs_data)
 
             parse_diff_json(lines, self.model)
         else:
-            lines = [line for line in self.fs_data.split('\n') if line]
-            parse_diff_lines(lines, self.model)
+            parse_diff_lines(iter_nonempty_lines(self.fs_data), self.model)
 
 
 class DiffResultDialog(DiffResultBase, DiffResultUI):
@@ -89,6 +93,11 @@ def __init__(self, archive_newer, archive_older, model: 'DiffTree'):
         shortcut_copy = QShortcut(QKeySequence.StandardKey.Copy, self.treeView)
         shortcut_copy.activated.connect(self.diff_item_copy)
 
+        # apply the display mode before the model is sorted by the proxy
+        self.comboBoxDisplayMode.currentIndexChanged.connect(self.change_display_mode)
+        diff_result_display_mode = SettingsModel.get(key='diff_files_display_mode').str_value
+        self.comboBoxDisplayMode.setCurrentIndex(int(diff_result_display_mode))
+
         # add sort proxy model
         self.sortproxy = DiffSortProxyModel(self)
         self.sortproxy.setSourceModel(self.model)
@@ -109,9 +118,6 @@ def __init__(self, archive_newer, archive_older, model: 'DiffTree'):
         self.archiveNameLabel_1.setText(f'{archive_newer.name}')
         self.archiveNameLabel_2.setText(f'{archive_older.name}')
 
-        self.comboBoxDisplayMode.currentIndexChanged.connect(self.change_display_mode)
-        diff_result_display_mode = SettingsModel.get(key='diff_files_display_mode').str_value
-        self.comboBoxDisplayMode.setCurrentIndex(int(diff_result_display_mode))
         self.bFoldersOnTop.toggled.connect(self.sortproxy.keepFoldersOnTop)
         self.bCollapseAll.clicked.connect(self.treeView.collapseAll)
 
@@ -172,11 +178,11 @@ def diff_item_copy(self, index: QModelIndex = None):
 
         index = self.sortproxy.mapToSource(index)
         item: DiffItem = index.internalPointer()
-        path = PurePath('/', *item.path)
+        path = '/' + '/'.join(item.path)
 
         data = QMimeData()
-        data.setUrls([QUrl(path.as_uri())])
-        data.setText(str(path))
+        data.setUrls([QUrl.fromLocalFile(path)])
+        data.setText(path)
 
         QApplication.clipboard().setMimeData(data)
 
@@ -217,10 +223,46 @@ def slot_sorted(self, column, order):
 # ---- Output parsing --------------------------------------------------------
 
 
-def parse_diff_json(diffs: List[dict], model: 'DiffTree'):
+re_line = re.compile(r'[^\n]+')
+
+
+def iter_nonempty_lines(fs_data: str) -> Iterator[str]:
+    """Yield the non-empty lines of the output without splitting it into a list first."""
+    return (match.group() for match in re_line.finditer(fs_data))
+
+
+def iter_json_lines(fs_data: str) -> Iterator[dict]:
+    """
+    Decode the json lines output from `borg diff` line by line.
+
+    `orjson` is used if it is installed.
+    """
+    return map(json_loads, iter_nonempty_lines(fs_data))
+
+
+def parse_diff_json(diffs: Iterable[dict], model: 'DiffTree'):
     """Parse the json output from `borg diff`."""
+    model.addItems(iter_diff_json(diffs))
+
+
+def shared_tuple(cache: Dict[tuple, tuple], values: tuple) -> tuple:
+    """
+    Return a single shared instance of `values` with interned strings.
+
+    Modes, users and groups repeat a lot, so equal tuples are only stored
+    once per parse.
+    """
+    shared = cache.get(values)
+    if shared is None:
+        shared = cache[values] = tuple(map(sys.intern, values))
+    return shared
+
+
+def iter_diff_json(diffs: Iterable[dict]) -> Iterator[Tuple[Path, 'DiffData']]:
+    """Yield the model items for the json output from `borg diff`."""
+    shared: Dict[tuple, tuple] = {}
     for item in diffs:
-        path = PurePath(item['path'])
+        path = str_to_path(item['path'])
         file_type = FileType.FILE
         changed_size = 0
         size = 0
@@ -241,68 +283,45 @@ def parse_diff_json(diffs: List[dict], model: 'DiffTree'):
         for change in item['changes']:
             # if more than one type of change has happened for this file/dir/link, then report the most important
             # (higher priority)
-            if {'type': 'modified'} == change:
-                # modified, but can't compare ids -> no added, removed
-                change_type = ChangeType.MODIFIED
-            elif change['type'] == 'modified':
-                # modified with added, removed
+            kind = change['type']
+            if kind == 'modified':
                 change_type = ChangeType.MODIFIED
-                size = change['added'] - change['removed']
-                modified = (change['added'], change['removed'])
-                changed_size = sum(modified)
+                # without added, removed borg couldn't compare the ids
+                if 'added' in change:
+                    size = change['added'] - change['removed']
+                    modified = (change['added'], change['removed'])
+                    changed_size = sum(modified)
 
-            elif change['type'] == 'changed link':
+            elif kind == 'changed link':
                 change_type = ChangeType.CHANGED_LINK
                 file_type = FileType.LINK
 
-            elif change['type'].startswith(('added', 'removed')):
-                if 'directory' in change['type']:
-                    file_type = FileType.DIRECTORY
-                elif 'link' in change['type']:
-                    file_type = FileType.LINK
-                elif 'chrdev' in change['type']:
-                    file_type = FileType.CHRDEV
-                elif 'blkdev' in change['type']:
-                    file_type = FileType.BLKDEV
-                elif 'fifo' in change['type']:
-                    file_type = FileType.FIFO
-                # else default FileType.FILE
-
-                size = change.get('size', 0)
-
-                a_r = change['type'].split()[0]  # 'added' or 'removed'
-                if a_r == 'added':
-                    change_type = ChangeType.ADDED
-                else:
-                    change_type = ChangeType.REMOVED
-                    size = -size
-
+            elif kind in added_removed_types:
+                change_type, file_type, sign = added_removed_types[kind]
+                size = sign * change.get('size', 0)
                 changed_size = size
 
-            elif change['type'] == 'mode':
+            elif kind == 'mode':
                 # mode change can occur along with previous changes
                 change_type = ChangeType.MODIFIED
-                mode_change = (change['old_mode'], change['new_mode'])
+                mode_change = shared_tuple(shared, (change['old_mode'], change['new_mode']))
 
-            elif change['type'] == 'owner':
+            elif kind == 'owner':
                 # owner change can occur along with previous changes
                 change_type = ChangeType.MODIFIED
 
-                owner_change = (
-                    change['old_user'],
-                    change['old_group'],
-                    change['new_user'],
-                    change['new_group'],
+                owner_change = shared_tuple(
+                    shared, (change['old_user'], change['old_group'], change['new_user'], change['new_group'])
                 )
 
-            elif change['type'] == 'ctime':
+            elif kind == 'ctime':
                 # ctime change can occur along with previous changes
                 change_type = ChangeType.MODIFIED
                 ctime_change = (
                     QDateTime.fromString(change['old_ctime'], Qt.DateFormat.ISODateWithMs),
                     QDateTime.fromString(change['new_ctime'], Qt.DateFormat.ISODateWithMs),
                 )
-            elif change['type'] == 'mtime':
+            elif kind == 'mtime':
                 # mtime change can occur along with previous changes
                 change_type = ChangeType.MODIFIED
                 mtime_change = (
@@ -311,50 +330,43 @@ def parse_diff_json(diffs: List[dict], model: 'DiffTree'):
                 )
 
             else:
-                raise Exception('Unknown change type: {}'.format(change['type']))
-
-        model.addItem(
-            (
-                path,
-                DiffData(
-                    file_type=file_type,
-                    change_type=change_type,
-                    changed_size=changed_size,
-                    size=size,
-                    mode_change=mode_change,
-                    owner_change=owner_change,
-                    ctime_change=ctime_change,
-                    mtime_change=mtime_change,
-                    modified=modified,
-                ),
-            )
+                raise Exception('Unknown change type: {}'.format(kind))
+
+        yield (
+            path,
+            DiffData(
+                file_type=file_type,
+                change_type=change_type,
+                changed_size=changed_size,
+                size=size,
+                mode_change=mode_change,
+                owner_change=owner_change,
+                ctime_change=ctime_change,
+                mtime_change=mtime_change,
+                modified=modified,
+            ),
         )
 
 
-# re pattern
-pattern_otypes = r'directory|link|fifo|chrdev|blkdev'
-pattern_ar = r'(?P<a_r>added|removed) ((?P<ar_type>' + pattern_otypes + r')|\s+(?P<size>[\d.]+) (?P<size_unit>\w+))\s*'
-pattern_cl = r'changed link\s*'
-pattern_modified = r'\s*\+?(?P<added>[\d.]+) (?P<added_unit>\w+)\s*-?(?P<removed>[\d.]+) (?P<removed_unit>\w+)'
-pattern_mode = r'\[(?P<old_mode>[\w-]{10}) -> (?P<new_mode>[\w-]{10})\]'
-pattern_owner = r'\[(?P<old_user>[\w ]+):(?P<old_group>[\w ]+) -> (?P<new_user>[\w ]+):(?P<new_group>[\w ]+)\]'
-pattern_path = r'(?P<path>.*)'
-pattern_changed_file = (
-    r'(({ar} )|((?P<cl>{cl} )|'
-    + r'((?P<modified>{modified}\s+)?)(?P<owner>{owner}\s+)?(?P<mode>{mode}\s+)?))'
-    + r'{path}'
-).format(
-    ar=pattern_ar,
-    cl=pattern_cl,
-    modified=pattern_modified,
-    mode=pattern_mode,
-    owner=pattern_owner,
-    path=pattern_path,
-)
-re_changed_file = re.compile(pattern_changed_file)
+# re patterns
+pattern_ar = r'(?P<a_r>added|removed) \s+(?P<size>[\d.]+) (?P<size_unit>\w+)\s+'
+pattern_cl = r'changed link\s+'
+pattern_modified = r'\s*\+?(?P<added>[\d.]+) (?P<added_unit>\w+)\s*-?(?P<removed>[\d.]+) (?P<removed_unit>\w+)\s+'
+pattern_mode = r'\[(?P<old_mode>[\w-]{10}) -> (?P<new_mode>[\w-]{10})\]\s+'
+pattern_owner = r'\[(?P<old_user>[\w ]+):(?P<old_group>[\w ]+) -> (?P<new_user>[\w ]+):(?P<new_group>[\w ]+)\]\s+'
+
+# Each pattern matches a single field of a line followed by the whitespace
+# separating it from the next field. `parse_diff_lines` decides which
+# patterns to try based on the start of the line. Added and removed items
+# without a size are recognized by their literal prefix instead.
+re_ar = re.compile(pattern_ar)
+re_cl = re.compile(pattern_cl)
+re_modified = re.compile(pattern_modified)
+re_mode = re.compile(pattern_mode)
+re_owner = re.compile(pattern_owner)
 
 
-def parse_diff_lines(lines: List[str], model: 'DiffTree'):
+def parse_diff_lines(lines: Iterable[str], model: 'DiffTree'):
     """
     Parse non-json diff output from borg.
 
@@ -376,16 +388,20 @@ def parse_diff_lines(lines: List[str], model: 'DiffTree'):
     the amount of `added` and `removed` bytes.
 
     """
+    model.addItems(iter_diff_lines(lines))
+
+
+def iter_diff_lines(lines: Iterable[str]) -> Iterator[Tuple[Path, 'DiffData']]:
+    """
+    Yield the model items for the non-json diff output from borg.
+
+    See `parse_diff_lines` for the format of the lines.
+    """
+    shared: Dict[tuple, tuple] = {}
     for line in lines:
         if not line:
             continue
 
-        parsed_line = re_changed_file.fullmatch(line)
-
-        if not parsed_line:
-            raise Exception("Couldn't parse diff output `{}`".format(line))
-
-        path = PurePath(parsed_line['path'])
         file_type = FileType.FILE
         size = 0
         changed_size = 0
@@ -394,52 +410,55 @@ def parse_diff_lines(lines: List[str], model: 'DiffTree'):
         owner_change: Optional[Tuple[str, str, str, str]] = None
         modified: Optional[Tuple[int, int]] = None
 
-        if parsed_line['a_r']:
-            # added or removed
-            if parsed_line['ar_type']:
-                if parsed_line['ar_type'] == 'directory':
-                    file_type = FileType.DIRECTORY
-                elif parsed_line['ar_type'] == 'link':
-                    file_type = FileType.LINK
-                elif parsed_line['ar_type'] == 'chrdev':
-                    file_type = FileType.CHRDEV
-                elif parsed_line['ar_type'] == 'blkdev':
-                    file_type = FileType.BLKDEV
-                elif parsed_line['ar_type'] == 'fifo':
-                    file_type = FileType.FIFO
-                else:
-                    raise ValueError(f"Unknown file type `{parsed_line['ar_type']}`")
+        if line.startswith(('added ', 'removed ')):
+            a_r, _, rest = line.partition(' ')
+
+            if not rest.startswith(' '):
+                # added or removed directory, link, ... -> literal prefix
+                ar_type, _, rest = rest.partition(' ')
+                info = added_removed_types.get(a_r + ' ' + ar_type)
+                if info is None:
+                    raise ValueError(f"Unknown file type `{ar_type}`")
+
+                change_type, file_type, _ = info
+                pos = len(line) - len(rest.lstrip())
             else:
-                # normal file
+                # added or removed file with size
+                parsed_line = re_ar.match(line)
+
+                if not parsed_line:
+                    raise Exception("Couldn't parse diff output `{}`".format(line))
+
+                pos = parsed_line.end()
                 size = size_to_byte(parsed_line['size'], parsed_line['size_unit'])
 
-            if parsed_line['a_r'] == 'added':
-                change_type = ChangeType.ADDED
-            elif parsed_line['a_r'] == 'removed':
-                change_type = ChangeType.REMOVED
-                size = -size
+                if a_r == 'added':
+                    change_type = ChangeType.ADDED
+                else:
+                    change_type = ChangeType.REMOVED
+                    size = -size
 
             changed_size = size
         else:
             change_type = ChangeType.MODIFIED
+            pos = 0
 
-            if parsed_line['owner']:
-                # owner changed
-                owner_change = (
-                    parsed_line['old_user'],
-                    parsed_line['old_group'],
-                    parsed_line['new_user'],
-                    parsed_line['new_group'],
-                )
-
-            if parsed_line['cl']:
+            if line.startswith('changed link'):
                 # link changed
                 # links can't have changed permissions
+                parsed_line = re_cl.match(line)
+
+                if not parsed_line:
+                    raise Exception("Couldn't parse diff output `{}`".format(line))
+
+                pos = parsed_line.end()
                 change_type = ChangeType.CHANGED_LINK
                 file_type = FileType.LINK
-            else:
-                # modified contents or mode
-                if parsed_line['modified']:
+            elif line[0] != '[':
+                # modified contents
+                parsed_line = re_modified.match(line)
+                if parsed_line:
+                    pos = parsed_line.end()
                     modified = (
                         size_to_byte(parsed_line['added'], parsed_line['added_unit']),
                         size_to_byte(parsed_line['removed'], parsed_line['removed_unit']),
@@ -448,42 +467,62 @@ def parse_diff_lines(lines: List[str], model: 'DiffTree'):
                     size = modified[0] - modified[1]
                     changed_size = sum(modified)
 
-                if parsed_line['mode']:
-                    mode_change = (parsed_line['old_mode'], parsed_line['new_mode'])
-
-        # add change to model
-        model.addItem(
-            (
-                path,
-                DiffData(
-                    file_type=file_type,
-                    change_type=change_type,
-                    changed_size=changed_size,
-                    size=size,
-                    mode_change=mode_change,
-                    owner_change=owner_change,
-                    modified=modified,
-                ),
-            )
+            if line.startswith('[', pos):
+                # owner changed
+                parsed_line = re_owner.match(line, pos)
+                if parsed_line:
+                    pos = parsed_line.end()
+                    owner_change = shared_tuple(
+                        shared, parsed_line.group('old_user', 'old_group', 'new_user', 'new_group')
+                    )
+
+            if file_type != FileType.LINK and line.startswith('[', pos):
+                # mode changed
+                parsed_line = re_mode.match(line, pos)
+                if parsed_line:
+                    pos = parsed_line.end()
+                    mode_change = shared_tuple(shared, parsed_line.group('old_mode', 'new_mode'))
+
+        path = str_to_path(line[pos:])
+
+        yield (
+            path,
+            DiffData(
+                file_type=file_type,
+                change_type=change_type,
+                changed_size=changed_size,
+                size=size,
+                mode_change=mode_change,
+                owner_change=owner_change,
+                modified=modified,
+            ),
         )
 
 
+#: The number of bytes of each unit identifier used by borg
+size_units = {
+    'B': 1,
+    'kB': 10**3,
+    'KB': 10**3,
+    'MB': 10**6,
+    'GB': 10**9,
+    'TB': 10**12,
+}
+
+
 def size_to_byte(significand: str, unit: str) -> int:
     """Convert a size with a unit identifier from borg into a number of bytes."""
-    if unit == 'B':
-        return int(significand)
-    elif unit == 'kB' or unit == 'KB':
-        return int(float(significand) * 10**3)
-    elif unit == 'MB':
-        return int(float(significand) * 10**6)
-    elif unit == 'GB':
-        return int(float(significand) * 10**9)
-    elif unit == 'TB':
-        return int(float(significand) * 10**12)
-    else:
+    scale = size_units.get(unit)
+    if scale is None:
         # unknown identifier
         raise Exception("Unknown unit `{}`".format(unit))
 
+    if scale == 1:
+        return int(significand)
+    if '.' in significand:
+        return int(float(significand) * scale)
+    return int(significand) * scale
+
 
 # ---- Sorting ---------------------------------------------------------------
 
@@ -501,11 +540,11 @@ def choose_data(self, index: QModelIndex):
         if column == 0:
             return self.extract_path(index)
         elif column == 1:
-            # change type
+            # change type, compared by its plain int value
             ct = item.data.change_type
-            if ct == ChangeType.NONE:
-                return ChangeType.MODIFIED
-            return ct
+            if ct is ChangeType.NONE:
+                return ChangeType.MODIFIED.value
+            return ct.value
         elif column == 2:
             return item.data.changed_size
         else:
@@ -588,13 +627,7 @@ class ChangeType(enum.Enum):
 
     def short(self):
         """Get a short identifier for the change type."""
-        if self == self.ADDED:
-            return 'A'
-        if self == self.REMOVED:
-            return 'D'
-        if self == self.MODIFIED:
-            return 'M'
-        return ''
+        return change_type_short[self]
 
     def __ge__(self, other):
         """Greater than or equal for enums."""
@@ -621,6 +654,15 @@ def __lt__(self, other):
         return NotImplemented
 
 
+#: The short identifiers of the change types
+change_type_short = {
+    ChangeType.NONE: '',
+    ChangeType.ADDED: 'A',
+    ChangeType.MODIFIED: 'M',
+    ChangeType.REMOVED: 'D',
+}
+
+
 class FileType(enum.Enum):
     """The possible file types of changed file."""
 
@@ -632,19 +674,85 @@ class FileType(enum.Enum):
     FIFO = enum.auto()
 
 
-@dataclass
+#: The change type, file type and size sign of the added/removed json change types
+added_removed_types = {
+    'added': (ChangeType.ADDED, FileType.FILE, 1),
+    'removed': (ChangeType.REMOVED, FileType.FILE, -1),
+    'added directory': (ChangeType.ADDED, FileType.DIRECTORY, 1),
+    'removed directory': (ChangeType.REMOVED, FileType.DIRECTORY, -1),
+    'added link': (ChangeType.ADDED, FileType.LINK, 1),
+    'removed link': (ChangeType.REMOVED, FileType.LINK, -1),
+    'added chrdev': (ChangeType.ADDED, FileType.CHRDEV, 1),
+    'removed chrdev': (ChangeType.REMOVED, FileType.CHRDEV, -1),
+    'added blkdev': (ChangeType.ADDED, FileType.BLKDEV, 1),
+    'removed blkdev': (ChangeType.REMOVED, FileType.BLKDEV, -1),
+    'added fifo': (ChangeType.ADDED, FileType.FIFO, 1),
+    'removed fifo': (ChangeType.REMOVED, FileType.FIFO, -1),
+}
+
+
 class DiffData:
-    """The data linked to a diff item."""
+    """
+    The data linked to a diff item.
 
-    file_type: FileType
-    change_type: ChangeType
-    changed_size: int  # total modified bits
-    size: int  # size change (disk usage)
-    mode_change: Optional[Tuple[str, str]] = None
-    owner_change: Optional[Tuple[str, str, str, str]] = None
-    ctime_change: Optional[Tuple[QDateTime, QDateTime]] = None
-    mtime_change: Optional[Tuple[QDateTime, QDateTime]] = None
-    modified: Optional[Tuple[int, int]] = None
+    This is a slotted class instead of a dataclass since there is one
+    instance per item of potentially huge diffs.
+    """
+
+    #: The fields compared for equality
+    _fields = (
+        'file_type',
+        'change_type',
+        'changed_size',
+        'size',
+        'mode_change',
+        'owner_change',
+        'ctime_change',
+        'mtime_change',
+        'modified',
+    )
+
+    __slots__ = _fields + ('tooltip',)
+
+    def __init__(
+        self,
+        file_type: FileType,
+        change_type: ChangeType,
+        changed_size: int,
+        size: int,
+        mode_change: Optional[Tuple[str, str]] = None,
+        owner_change: Optional[Tuple[str, str, str, str]] = None,
+        ctime_change: Optional[Tuple[QDateTime, QDateTime]] = None,
+        mtime_change: Optional[Tuple[QDateTime, QDateTime]] = None,
+        modified: Optional[Tuple[int, int]] = None,
+    ):
+        """Init."""
+        self.file_type = file_type
+        self.change_type = change_type
+        self.changed_size = changed_size  # total modified bits
+        self.size = size  # size change (disk usage)
+        self.mode_change = mode_change
+        self.owner_change = owner_change
+        self.ctime_change = ctime_change
+        self.mtime_change = mtime_change
+        self.modified = modified
+
+        #: The tooltip built by `DiffTree.data`, the size isn't part of it
+        self.tooltip: Optional[str] = None
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        return all(getattr(self, field) == getattr(other, field) for field in self._fields)
+
+    __hash__ = None  # mutable
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={!r}'.format(field, getattr(self, field)) for field in self._fields),
+        )
 
 
 DiffItem = FileSystemItem[DiffData]
@@ -653,6 +761,47 @@ class DiffData:
 class DiffTree(FileTreeModel[DiffData]):
     """The file tree model for diff results."""
 
+    def __init__(self, mode: FileTreeModel.DisplayMode = FileTreeModel.DisplayMode.TREE, parent=None):
+        """Init."""
+        super().__init__(mode, parent)
+        self._colors: Dict[ChangeType, QColor] = {}
+
+        # translated strings of the tooltips
+        self._filetype_tr = {
+            FileType.FILE: self.tr("File"),
+            FileType.DIRECTORY: self.tr("Directory"),
+            FileType.LINK: self.tr("Link"),
+            FileType.BLKDEV: self.tr("Block device file"),
+            FileType.CHRDEV: self.tr("Character device file"),
+        }
+        self._changetype_tr = {
+            ChangeType.NONE: self.tr("unchanged"),
+            ChangeType.MODIFIED: self.tr("modified"),
+            ChangeType.REMOVED: self.tr("removed"),
+            ChangeType.ADDED: self.tr("added"),
+        }
+        self._modified_template = self.tr("Added {}, deleted {}")
+
+        app = QApplication.instance()
+        if app:
+            self.update_colors()
+            app.paletteChanged.connect(self.update_colors)
+
+    def update_colors(self, *args):
+        """Select the foreground colours of the change types for the current palette."""
+        if uses_dark_mode():
+            self._colors = {
+                ChangeType.ADDED: QColor(Qt.GlobalColor.green),
+                ChangeType.MODIFIED: QColor(Qt.GlobalColor.yellow),
+                ChangeType.REMOVED: QColor(Qt.GlobalColor.red),
+            }
+        else:
+            self._colors = {
+                ChangeType.ADDED: QColor(Qt.GlobalColor.darkGreen),
+                ChangeType.MODIFIED: QColor(Qt.GlobalColor.darkYellow),
+                ChangeType.REMOVED: QColor(Qt.GlobalColor.darkRed),
+            }
+
     def _make_filesystemitem(self, path, data):
         return super()._make_filesystemitem(path, data)
 
@@ -691,7 +840,7 @@ def _process_child(self, child):
         This can make some changes to the child's data like
         setting a default value if the child's data is None.
         This can also update the data of the parent.
-        This must emit `dataChanged` if data is changed.
+        No `dataChanged` is needed since this is called during a model reset.
 
         Parameters
         ----------
@@ -700,30 +849,21 @@ def _process_child(self, child):
         """
         parent = child._parent
 
-        if not child.data:
+        if child.data is None:
             child.data = DiffData(FileType.DIRECTORY, ChangeType.NONE, 0, 0)
 
         if child.data.size != 0 or child.data.changed_size != 0:
-            # update size
+            # update size of all ancestors
             size = child.data.size
             changed_size = child.data.changed_size
 
-            def add_size(parent):
-                if parent is self.root:
-                    return
-
+            while parent and parent is not self.root:
                 if parent.data is None:
                     raise Exception("Item {} without data".format(path_to_str(parent.path)))
-                else:
-                    parent.data.size += size
-                    parent.data.changed_size += changed_size
 
-                # update parent
+                parent.data.size += size
+                parent.data.changed_size += changed_size
                 parent = parent._parent
-                if parent:
-                    add_size(parent)
-
-            add_size(parent)
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """
@@ -827,7 +967,7 @@ def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
                 return item.subpath
             elif column == 1:
                 # change type
-                return item.data.change_type.short()
+                return change_type_short[item.data.change_type]
             elif column == 2:
                 return pretty_bytes(item.data.changed_size)
             else:
@@ -835,86 +975,75 @@ def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
                 return pretty_bytes(item.data.size)
 
         if role == Qt.ItemDataRole.ForegroundRole:
-            # colour
-            if item.data.change_type == ChangeType.ADDED:
-                return QColor(Qt.GlobalColor.green) if uses_dark_mode() else QColor(Qt.GlobalColor.darkGreen)
-            if item.data.change_type == ChangeType.MODIFIED:
-                return QColor(Qt.GlobalColor.yellow) if uses_dark_mode() else QColor(Qt.GlobalColor.darkYellow)
-            if item.data.change_type == ChangeType.REMOVED:
-                return QColor(Qt.GlobalColor.red) if uses_dark_mode() else QColor(Qt.GlobalColor.darkRed)
-            return None  # no change
+            # colour, None if there is no change
+            return self._colors.get(item.data.change_type)
 
         if role == Qt.ItemDataRole.ToolTipRole:
             if column == 0:
                 # name column -> display fullpath
                 return path_to_str(item.path)
 
+            if item.data.tooltip is not None:
+                return item.data.tooltip
+
             # info/data tooltip -> no real size limitation
             tooltip_template = "{name}\n" + "\n" + "{filetype} {changetype}"
 
-            modified_template = self.tr("Added {}, deleted {}")
+            modified_template = self._modified_template
             owner_template = "{: <10} -> {: >10}"
             time_template = "{}: {} -> {}"
             permission_template = "{} -> {}"
 
             # format
-            if item.data.file_type == FileType.FILE:
-                filetype = self.tr("File")
-            elif item.data.file_type == FileType.DIRECTORY:
-                filetype = self.tr("Directory")
-            elif item.data.file_type == FileType.LINK:
-                filetype = self.tr("Link")
-            elif item.data.file_type == FileType.BLKDEV:
-                filetype = self.tr("Block device file")
-            elif item.data.file_type == FileType.CHRDEV:
-                filetype = self.tr("Character device file")
-            else:
+            filetype = self._filetype_tr.get(item.data.file_type)
+            if filetype is None:
                 raise Exception("Unknown filetype {}".format(item.data.file_type))
 
-            if item.data.change_type == ChangeType.NONE:
-                changetype = self.tr("unchanged")
-            elif item.data.change_type == ChangeType.MODIFIED:
-                changetype = self.tr("modified")
-            elif item.data.change_type == ChangeType.REMOVED:
-                changetype = self.tr("removed")
-            elif item.data.change_type == ChangeType.ADDED:
-                changetype = self.tr("added")
-            else:
+            changetype = self._changetype_tr.get(item.data.change_type)
+            if changetype is None:
                 raise Exception("Unknown changetype {}".format(item.data.change_type))
 
-            tooltip = tooltip_template.format(name=item.path[-1], filetype=filetype, changetype=changetype)
+            lines = [tooltip_template.format(name=item.path[-1], filetype=filetype, changetype=changetype)]
             if item.data.modified:
-                tooltip += '\n'
-                tooltip += modified_template.format(
-                    pretty_bytes(item.data.modified[0]),
-                    pretty_bytes(item.data.modified[1]),
+                lines.append(
+                    modified_template.format(
+                        pretty_bytes(item.data.modified[0]),
+                        pretty_bytes(item.data.modified[1]),
+                    )
                 )
 
             if item.data.mode_change:
-                tooltip += '\n'
-                tooltip += permission_template.format(*item.data.mode_change)
+                lines.append(permission_template.format(*item.data.mode_change))
 
             if item.data.owner_change:
-                tooltip += '\n'
-                tooltip += owner_template.format(
-                    '{}:{}'.format(item.data.owner_change[0], item.data.owner_change[1]),
-                    "{}:{}".format(item.data.owner_change[2], item.data.owner_change[3]),
+                lines.append(
+                    owner_template.format(
+                        '{}:{}'.format(item.data.owner_change[0], item.data.owner_change[1]),
+                        "{}:{}".format(item.data.owner_change[2], item.data.owner_change[3]),
+                    )
                 )
 
+            if item.data.ctime_change or item.data.mtime_change:
+                locale = QLocale.system()
+
             if item.data.ctime_change:
-                tooltip += '\n'
-                tooltip += time_template.format(
-                    "Creation Time",
-                    QLocale.system().toString(item.data.ctime_change[0], QLocale.FormatType.ShortFormat),
-                    QLocale.system().toString(item.data.ctime_change[1], QLocale.FormatType.ShortFormat),
+                lines.append(
+                    time_template.format(
+                        "Creation Time",
+                        locale.toString(item.data.ctime_change[0], QLocale.FormatType.ShortFormat),
+                        locale.toString(item.data.ctime_change[1], QLocale.FormatType.ShortFormat),
+                    )
                 )
 
             if item.data.mtime_change:
-                tooltip += '\n'
-                tooltip += time_template.format(
-                    "Modification Time",
-                    QLocale.system().toString(item.data.mtime_change[0], QLocale.FormatType.ShortFormat),
-                    QLocale.system().toString(item.data.mtime_change[1], QLocale.FormatType.ShortFormat),
+                lines.append(
+                    time_template.format(
+                        "Modification Time",
+                        locale.toString(item.data.mtime_change[0], QLocale.FormatType.ShortFormat),
+                        locale.toString(item.data.mtime_change[1], QLocale.FormatType.ShortFormat),
+                    )
                 )
 
+            tooltip = '\n'.join(lines)
+            item.data.tooltip = tooltip
             return tooltip
@@ -1,10 +1,9 @@
 import enum
-import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import PurePath
-from typing import Optional, Union
+from typing import Iterator, Optional, Tuple, Union
 
 from PyQt6 import uic
 from PyQt6.QtCore import (
@@ -38,6 +37,11 @@
     relative_path,
 )
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 uifile = get_asset("UI/extractdialog.ui")
 ExtractDialogUI, ExtractDialogBase = uic.loadUiType(uifile)
 
@@ -59,7 +63,7 @@ def run(self) -> None:
         if isinstance(self.fs_data, dict):
             lines = [self.fs_data]
         else:
-            lines = [json.loads(line) for line in self.fs_data.split("\n") if line]
+            lines = (json_loads(line) for line in self.fs_data.split("\n") if line)
 
         parse_json_lines(lines, self.model)
 
@@ -85,6 +89,11 @@ def __init__(self, archive, model):
         self.treeView.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.treeView.customContextMenuRequested.connect(self.treeview_context_menu)
 
+        # apply the display mode before the model is sorted by the proxy
+        diff_result_display_mode = SettingsModel.get(key='extract_files_display_mode').str_value
+        self.comboBoxDisplayMode.currentIndexChanged.connect(self.change_display_mode)
+        self.comboBoxDisplayMode.setCurrentIndex(int(diff_result_display_mode))
+
         # add sort proxy model
         self.sortproxy = ExtractSortProxyModel(self)
         self.sortproxy.setSourceModel(self.model)
@@ -113,11 +122,8 @@ def __init__(self, archive, model):
         self.buttonBox.addButton(self.extractButton, QDialogButtonBox.ButtonRole.AcceptRole)
 
         self.archiveNameLabel.setText(f"{archive.name}, {archive.time}")
-        diff_result_display_mode = SettingsModel.get(key='extract_files_display_mode').str_value
 
         # connect signals
-        self.comboBoxDisplayMode.currentIndexChanged.connect(self.change_display_mode)
-        self.comboBoxDisplayMode.setCurrentIndex(int(diff_result_display_mode))
         self.bFoldersOnTop.toggled.connect(self.sortproxy.keepFoldersOnTop)
         self.bCollapseAll.clicked.connect(self.treeView.collapseAll)
 
@@ -222,6 +228,13 @@ def treeview_context_menu(self, pos: QPoint):
 
 def parse_json_lines(lines, model: "ExtractTree"):
     """Parse json output of `borg list`."""
+    model.addItems(iter_list_json(lines))
+
+
+def iter_list_json(lines) -> Iterator[Tuple[PurePath, "FileData"]]:
+    """Yield the model items for the json output of `borg list`."""
+    mtime_key = 'isomtime' if borg_compat.check('V122') else 'mtime'
+
     for item in lines:
         path = PurePath(item["path"])
 
@@ -241,15 +254,11 @@ def parse_json_lines(lines, model: "ExtractTree"):
         # except ValueError:
         #     modified = datetime.strptime(item["mtime"], "%Y-%m-%dT%H:%M:%S")
 
-        modified = QDateTime.fromString(
-            item['isomtime' if borg_compat.check('V122') else 'mtime'], Qt.DateFormat.ISODateWithMs
-        )
+        modified = QDateTime.fromString(item[mtime_key], Qt.DateFormat.ISODateWithMs)
 
-        model.addItem(
-            (
-                path,
-                FileData(file_type, size, mode, user, group, health, modified, source_path),
-            )
+        yield (
+            path,
+            FileData(file_type, size, mode, user, group, health, modified, source_path),
         )
 
 
@@ -348,7 +357,7 @@ def _process_child(self, child):
         This can make some changes to the child's data like
         setting a default value if the child's data is None.
         This can also update the data of the parent.
-        This must emit `dataChanged` if data is changed.
+        No `dataChanged` is needed since this is called during a model reset.
 
         Parameters
         ----------
@@ -357,28 +366,19 @@ def _process_child(self, child):
         """
         parent = child._parent
 
-        if not child.data:
+        if child.data is None:
             child.data = FileData(FileType.DIRECTORY, 0, "", "", "", True, datetime.now())
 
         if child.data.size != 0:
-            # update size
+            # update size of all ancestors
             size = child.data.size
 
-            def add_size(parent):
-                if parent is self.root:
-                    return
-
+            while parent and parent is not self.root:
                 if parent.data is None:
                     raise Exception("Item {} without data".format(path_to_str(parent.path)))
-                else:
-                    parent.data.size += size
 
-                # update parent
+                parent.data.size += size
                 parent = parent._parent
-                if parent:
-                    add_size(parent)
-
-            add_size(parent)
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """
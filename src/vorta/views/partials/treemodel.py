@@ -6,9 +6,22 @@
 import bisect
 import enum
 import os.path as osp
-from functools import reduce
+import sys
+from operator import attrgetter
 from pathlib import PurePath
-from typing import Generic, List, Optional, Sequence, Tuple, TypeVar, Union, overload
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from PyQt6.QtCore import (
     QAbstractItemModel,
@@ -40,6 +53,16 @@ def path_to_str(path: PathLike) -> str:
     return osp.join(*path)
 
 
+def str_to_path(path: str) -> Path:
+    """
+    Split a posix path string into a path.
+
+    This is a cheaper alternative to `PurePath(path).parts` for the relative
+    paths output by borg.
+    """
+    return tuple(p for p in path.split('/') if p and p != '.')
+
+
 #: Type of FileSystemItem's data
 T = TypeVar('T')
 FileSystemItemLike = Union[Tuple[Union[PurePath, Path], Optional[T]], 'FileSystemItem']
@@ -54,8 +77,8 @@ class FileSystemItem(Generic[T]):
 
     ..warning::
 
-        Do not edit `children` manually. Always use `add` or `remove` or
-        `sort`.
+        Do not edit `children` or `child_map` manually. Always use `add` or
+        `remove` or `sort`.
 
     Attributes
     ----------
@@ -64,14 +87,16 @@ class FileSystemItem(Generic[T]):
     data : Any
         The data belonging to this item.
     children : List[FileSystemItem]
-        The children of this item.
+        The children of this item sorted by their subpath.
+    child_map : Dict[str, FileSystemItem]
+        The children of this item by their subpath.
     _subpath : str
         The subpath of this item relative to its parent.
     _parent : FileSystemItem or None
         The parent of the item.
     """
 
-    __slots__ = ['path', 'children', 'data', '_parent', 'subpath']
+    __slots__ = ['path', 'children', 'child_map', '_subpaths', 'data', '_parent', 'subpath', '_row']
 
     def __init__(self, path: PathLike, data: T):
         """Init."""
@@ -79,7 +104,11 @@ def __init__(self, path: PathLike, data: T):
         self.data = data
         self.subpath: str = None
         self.children: List[FileSystemItem[T]] = []
+        self.child_map: Dict[str, FileSystemItem[T]] = {}
+        #: subpaths of `children` for bisecting with string comparisons
+        self._subpaths: List[str] = []
         self._parent: Optional[FileSystemItem[T]] = None
+        self._row: int = 0  # cached by `row`
 
     # @property
     # def subpath(self) -> str:
@@ -93,13 +122,14 @@ def __init__(self, path: PathLike, data: T):
     #     """Get an iterable view of the item's children."""
     #     return self.child_map.values()
 
-    def add(self, child: 'FileSystemItem[T]', _subpath: str = None, _check: bool = True):
+    def add(self, child: 'FileSystemItem[T]', _subpath: str = None, _check: bool = True, _sort: bool = True):
         """
         Add a child.
 
         The parameters starting with an underscore exist for performance
         reasons only. They should only be used if the operations that these
-        parameters toggle were performed already.
+        parameters toggle were performed already or will be performed
+        later on.
 
         Parameters
         ----------
@@ -108,22 +138,35 @@ def add(self, child: 'FileSystemItem[T]', _subpath: str = None, _check: bool = T
         _subpath : str, optional
             Precalculated subpath, default is None.
         _check : bool, optional
-            Whether to check for children with the same subpath (using `get`).
+            Whether to check for children with the same subpath.
+        _sort : bool, optional
+            Whether to insert the child at its sorted position. If False the
+            child is appended and `sort_children` must be called afterwards.
         """
         if _subpath is not None:
             child.subpath = _subpath
         else:
             child.subpath = path_to_str(relative_path(self.path, child.path))
 
-        i = bisect.bisect(self.children, child)
-
         # check for a child with the same subpath
-        if _check and len(self.children) > i - 1 >= 0 and self.children[i - 1].subpath == child.subpath:
+        if _check and child.subpath in self.child_map:
             raise RuntimeError("The subpath must be unique to a parent's children.")
 
         # add
         child._parent = self
-        self.children.insert(i, child)
+        if _sort:
+            i = bisect.bisect(self._subpaths, child.subpath)
+            self.children.insert(i, child)
+            self._subpaths.insert(i, child.subpath)
+        else:
+            self.children.append(child)
+            self._subpaths.append(child.subpath)
+        self.child_map[child.subpath] = child
+
+    def sort_children(self):
+        """Sort the children by their subpath."""
+        self.children.sort(key=attrgetter('subpath'))
+        self._subpaths = [child.subpath for child in self.children]
 
     def addChildren(self, children: List['FileSystemItem[T]']):
         """
@@ -173,23 +216,29 @@ def remove(self, child_subpath_index):
             if not child.subpath:
                 raise ValueError("Child without subpath")
 
-            i = bisect.bisect_left(self.children, child)
-            if i < len(self.children) and self.children[i] == child:
-                del self.children[i]
-            else:
+            if self.child_map.get(child.subpath) is not child:
                 raise ValueError("Child not found")
 
+            i = bisect.bisect_left(self._subpaths, child.subpath)
+            del self.children[i]
+            del self._subpaths[i]
+            del self.child_map[child.subpath]
+
         elif isinstance(child_subpath_index, str):
             subpath = child_subpath_index
-            i = bisect.bisect_left(self.children, subpath)
-            if i < len(self.children) and self.children[i].subpath == subpath:
-                del self.children[i]
-            else:
+            if subpath not in self.child_map:
                 raise ValueError("Child not found")
 
+            i = bisect.bisect_left(self._subpaths, subpath)
+            del self.children[i]
+            del self._subpaths[i]
+            del self.child_map[subpath]
+
         elif isinstance(child_subpath_index, int):
             i = child_subpath_index
+            del self.child_map[self.children[i].subpath]
             del self.children[i]
+            del self._subpaths[i]
 
         else:
             raise TypeError(
@@ -227,13 +276,49 @@ def get(self, subpath: str, default: Optional[A] = None) -> Union[Tuple[int, 'Fi
         -------
         Tuple[int, FileSystemItem] or None
             The index and item if found else `default`.
+
+        See also
+        --------
+        get_child : Find a child without determining its index.
+        """
+        child = self.child_map.get(subpath)
+        if child is None:
+            return default
+        return bisect.bisect_left(self._subpaths, subpath), child
+
+    def get_child(self, subpath: str) -> Optional['FileSystemItem[T]']:
+        """
+        Find direct child with given subpath.
+
+        Parameters
+        ----------
+        subpath : str
+            The items subpath relative to this.
+
+        Returns
+        -------
+        FileSystemItem or None
+            The child if found else None.
+        """
+        return self.child_map.get(subpath)
+
+    def row(self) -> int:
+        """
+        Get the index of this item in the children of its parent.
+
+        The index is cached. It is only searched again if the children
+        of the parent changed in a way that moved this item.
+
+        Returns
+        -------
+        int
+            The index in `children` of the parent.
         """
-        i = bisect.bisect_left(self.children, subpath)
-        if i < len(self.children):
-            child = self.children[i]
-            if child.subpath == subpath:
-                return i, child
-        return default
+        siblings = self._parent.children
+        row = self._row
+        if row >= len(siblings) or siblings[row] is not self:
+            row = self._row = bisect.bisect_left(self._parent._subpaths, self.subpath)
+        return row
 
     def get_path(self, path: PathLike) -> Optional['FileSystemItem[T]']:
         """
@@ -245,16 +330,11 @@ def get_path(self, path: PathLike) -> Optional['FileSystemItem[T]']:
             The subpath.
         """
 
-        def walk(fsi, pp):
+        fsi = self  # empty path -> self
+        for subpath in path:
+            fsi = fsi.child_map.get(subpath)
             if fsi is None:
                 return None
-            res = fsi.get(pp)
-            if not res:
-                return None
-            i, item = res
-            return item
-
-        fsi = reduce(walk, path, self)  # handles empty path -> returns self
         return fsi
 
     def __repr__(self):
@@ -339,21 +419,49 @@ def __init__(self, mode: 'FileTreeModel.DisplayMode' = DisplayMode.TREE, parent=
         self.mode = mode
         #: flat representation of the tree
         self._flattened: List[FileSystemItem] = []
-
-    def addItems(self, items: List[FileSystemItemLike[T]]):
+        #: paths of the items in `_flattened` for bisecting with tuple comparisons
+        self._flat_paths: List[Path] = []
+        #: items whose children were appended unsorted by `addItems`
+        self._unsorted: Optional[Dict[int, FileSystemItem]] = None
+        #: whether `addItems` appended to `_flattened` unsorted
+        self._flat_unsorted = False
+
+    def addItems(self, items: Iterable[FileSystemItemLike[T]]):
         """
         Add file system items to the model.
 
         This method can be used for populating the model.
-        Calls `addItem` for each item.
+        All items are added within a single model reset.
+        Adding is fastest if items with the same parent follow each other
+        like in the output of borg. New items are appended and sorted
+        once after all items were added.
 
         Parameters
         ----------
-        items : List[FileSystemItemLike]
+        items : Iterable[FileSystemItemLike]
             The items.
         """
-        for item in items:
-            self.addItem(item)
+        self.beginResetModel()
+
+        self._unsorted = {}
+        try:
+            parent = None
+            for item in items:
+                parent = self._addItem(item, parent)
+        finally:
+            self._sort_unsorted()
+            self.endResetModel()
+
+    def _sort_unsorted(self):
+        """Sort what `addItems` appended out of order."""
+        for item in self._unsorted.values():
+            item.sort_children()
+        self._unsorted = None
+
+        if self._flat_unsorted:
+            self._flattened.sort(key=attrgetter('path'))
+            self._flat_paths = [item.path for item in self._flattened]
+            self._flat_unsorted = False
 
     def addItem(self, item: FileSystemItemLike[T]):
         """
@@ -364,6 +472,32 @@ def addItem(self, item: FileSystemItemLike[T]):
         item : FileSystemItemLike
             The item.
         """
+        self.beginResetModel()
+        self._addItem(item)
+        self.endResetModel()
+
+    def _addItem(
+        self, item: FileSystemItemLike[T], _parent: Optional[FileSystemItem[T]] = None
+    ) -> Optional[FileSystemItem[T]]:
+        """
+        Add a file system item to the tree without notifying any views.
+
+        This is called by `addItem` and `addItems` which take care of
+        resetting the model.
+
+        Parameters
+        ----------
+        item : FileSystemItemLike
+            The item.
+        _parent : FileSystemItem, optional
+            The parent of the previously added item. It is used without
+            walking the tree if it is the parent of this item too.
+
+        Returns
+        -------
+        FileSystemItem or None
+            The parent of the added item.
+        """
         path = item[0]
         data = item[1]
 
@@ -371,20 +505,26 @@ def addItem(self, item: FileSystemItemLike[T]):
             path = path.parts
 
         if not path:
-            return  # empty path (e.g. `.`) can't be added
-
-        self.beginResetModel()
+            return None  # empty path (e.g. `.`) can't be added
 
-        def child(tup, subpath):
-            fsi, i = tup
-            i += 1
-            return self._addChild(fsi, path[:i], subpath, None), i
+        # items store their whole path, intern the components to share
+        # them between the items and compare them by identity
+        path = tuple(map(sys.intern, path))
 
-        fsi, dummy = reduce(child, path[:-1], (self.root, 0))
+        if _parent is not None and _parent.path == path[:-1]:
+            fsi = _parent
+        else:
+            # walk down existing parents, the path of a parent is only sliced
+            # when it has to be created
+            fsi = self.root
+            for i, subpath in enumerate(path[:-1]):
+                child = fsi.get_child(subpath)
+                if child is None:
+                    child = self._addChild(fsi, path[: i + 1], subpath, None)
+                fsi = child
 
         self._addChild(fsi, path, path[-1], data)
-
-        self.endResetModel()
+        return fsi
 
     def _addChild(
         self, item: FileSystemItem[T], path: PathLike, path_part: str, data: Optional[T]
@@ -392,8 +532,9 @@ def _addChild(
         """
         Add a child to an item.
 
-        This is called by `addItem` in a reduce statement. It should
-        add a new child with the given attributes to the given item.
+        This is called by `_addItem` for the item itself and all of its
+        parents that don't exist yet. It should add a new child with the
+        given attributes to the given item.
         This implementation provides a reasonable default, most subclasses
         wont need to override this method. The implementation should make use
         of `_make_filesystemitem`, `_merge_data`, `_add_children`.
@@ -416,19 +557,32 @@ def _addChild(
         FileSystemItem
             [description]
         """
-        res = item.get(path_part)
-        if res:
-            i, child = res
+        child = item.get_child(path_part)
+        if child is not None:
             if data is not None:
                 self._merge_data(child, data)
         else:
             child = self._make_filesystemitem(path, data)
 
-            if self._flat_filter(child):
-                i = bisect.bisect(self._flattened, child.path)
-                self._flattened.insert(i, child)
+            unsorted = self._unsorted
+            if unsorted is None:
+                if self._flat_filter(child):
+                    i = bisect.bisect(self._flat_paths, child.path)
+                    self._flattened.insert(i, child)
+                    self._flat_paths.insert(i, child.path)
+
+                item.add(child, _subpath=path_part, _check=False)
+            else:
+                # adding many items, sort them afterwards
+                if self._flat_filter(child):
+                    if self._flat_paths and child.path < self._flat_paths[-1]:
+                        self._flat_unsorted = True
+                    self._flattened.append(child)
+                    self._flat_paths.append(child.path)
 
-            item.add(child, _subpath=path_part, _check=False)
+                if item._subpaths and path_part < item._subpaths[-1]:
+                    unsorted[id(item)] = item
+                item.add(child, _subpath=path_part, _check=False, _sort=False)
 
             # update parent data
             self._process_child(child)
@@ -469,6 +623,10 @@ def _process_child(self, child: FileSystemItem[T]):
         setting a default value if the child's data is None.
         This can also update the data of the parent.
 
+        This is only called while the model is being reset by `addItem`
+        or `addItems`, so there is no need to emit `dataChanged` for
+        modified items.
+
         Parameters
         ----------
         child : FileSystemItem
@@ -491,7 +649,7 @@ def _merge_data(self, item: FileSystemItem[T], data: Optional[T]):
         data : Any or None
             The data to add.
         """
-        if not item.data:
+        if item.data is None:
             item.data = data
 
     def removeItem(self, path: Union[PurePath, PathLike]) -> None:
@@ -509,8 +667,6 @@ def removeItem(self, path: Union[PurePath, PathLike]) -> None:
         if not path:
             return
 
-        self.beginResetModel()
-
         parent = self.getItem(path[:-1])
 
         if not parent:
@@ -523,16 +679,15 @@ def removeItem(self, path: Union[PurePath, PathLike]) -> None:
 
         i, item = res
 
-        # remove item and its children in flat representation
-        items_to_remove: List[FileSystemItem] = [item]
-        while items_to_remove:
-            to_remove = items_to_remove.pop()
-
-            fi = bisect.bisect_left(self._flattened, to_remove.path)
-            if fi < len(self._flattened) and self._flattened[fi] is to_remove:
-                del self._flattened[fi]
+        self.beginResetModel()
 
-            items_to_remove.extend(to_remove.children)
+        # remove item and its children in flat representation,
+        # they form a contiguous range of the sorted paths
+        path = item.path
+        start = bisect.bisect_left(self._flat_paths, path)
+        end = bisect.bisect_left(self._flat_paths, path[:-1] + (path[-1] + '\0',), start)
+        del self._flattened[start:end]
+        del self._flat_paths[start:end]
 
         # remove item from tree representation
         parent.remove(i)
@@ -710,36 +865,32 @@ def indexPath(self, path: Union[PurePath, PathLike]) -> QModelIndex:
 
         # flat mode
         if self.mode == self.DisplayMode.FLAT:
-            i = bisect.bisect_left(self._flattened, path)
-            if i < len(self._flattened) and self._flattened[i].path == path:
+            path = tuple(path)
+            i = bisect.bisect_left(self._flat_paths, path)
+            if i < len(self._flat_paths) and self._flat_paths[i] == path:
                 return self.index(i, 0)
             return QModelIndex()
 
         # tree mode
         simplified = self.mode == self.DisplayMode.SIMPLIFIED_TREE
 
-        def step(tup, subpath):
-            index, i, item = tup
-
-            if not item:
-                return index, None
+        index = QModelIndex()
+        row = -1  # row of the first item combined in simplified mode
+        item = self.root
+        for subpath in path:
+            item = item.get_child(subpath)
 
-            r, child = item.get(subpath)
+            if item is None:
+                return QModelIndex()
 
-            if not child:
-                return QModelIndex(), None
+            if row == -1:
+                row = item.row()
 
-            if i <= -1:
-                i = r
+            if simplified and len(item.children) == 1 and self._simplify_filter(item):
+                continue  # combined with its child
 
-            if simplified and len(child.children) == 1 and self._simplify_filter(child):
-                return index, i, child
-
-            index = self.index(i if simplified else r, 0, index)
-
-            return index, -1, child
-
-        index, i, item = reduce(step, path, (QModelIndex(), -1, self.root))
+            index = self.index(row, 0, index)
+            row = -1
 
         return index
 
@@ -774,17 +925,17 @@ def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> Q
         else:
             parent_item = parent.internalPointer()
 
-        item = list(parent_item.children)[row]
+        if not (0 <= row < len(parent_item.children) and 0 <= column < self.columnCount(parent)):
+            return QModelIndex()
+
+        item = parent_item.children[row]
 
         if self.mode == self.DisplayMode.SIMPLIFIED_TREE:
             # combine items with a single child with that child
             while len(item.children) == 1 and self._simplify_filter(item):
                 item = item.children[0]
 
-        if 0 <= row < len(parent_item.children) and 0 <= column < self.columnCount(parent):
-            return self.createIndex(row, column, item)
-
-        return QModelIndex()
+        return self.createIndex(row, column, item)
 
     @overload
     def parent(self, child: QModelIndex) -> QModelIndex:
@@ -842,8 +993,7 @@ def parent(self, child=None):
             # Never return root item since it shouldn't be displayed
             return QModelIndex()
 
-        row, item = parent_item._parent.get(parent_item.subpath)
-        return self.createIndex(row, 0, parent_item)
+        return self.createIndex(parent_item.row(), 0, parent_item)
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlag:
         """
@@ -908,6 +1058,55 @@ def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.folders_on_top = False
 
+        #: The sort keys by column and internal id of the source index.
+        self._sort_keys: Dict[int, Dict[int, Any]] = {}
+
+    def setSourceModel(self, model: QAbstractItemModel):
+        """
+        Set the source model that is sorted by this proxy.
+
+        Connects the signals that invalidate the cached sort keys. They
+        are connected before the proxy connects to the source model, so that
+        the keys are cleared before the proxy sorts again.
+
+        Parameters
+        ----------
+        model : QAbstractItemModel
+            The new source model.
+        """
+        old_model = self.sourceModel()
+        if old_model is not None:
+            for signal in self._invalidating_signals(old_model):
+                signal.disconnect(self.clearSortKeys)
+
+        self.clearSortKeys()
+
+        if model is not None:
+            for signal in self._invalidating_signals(model):
+                signal.connect(self.clearSortKeys)
+
+        super().setSourceModel(model)
+
+    @staticmethod
+    def _invalidating_signals(model: QAbstractItemModel):
+        """Get the signals of a source model that invalidate the sort keys."""
+        return (
+            model.modelAboutToBeReset,
+            model.layoutAboutToBeChanged,
+            model.rowsAboutToBeRemoved,
+            model.dataChanged,
+        )
+
+    def clearSortKeys(self, *args):
+        """
+        Clear the cached sort keys.
+
+        This must be called when the data returned by `choose_data`
+        changes. The signals of the source model are connected to this
+        method already.
+        """
+        self._sort_keys.clear()
+
     @overload
     def keepFoldersOnTop(self) -> bool:
         ...
@@ -966,6 +1165,25 @@ def choose_data(self, index: QModelIndex):
             "Method `choose_data` of " + "FileTreeSortProxyModel" + " must be implemented by subclasses."
         )
 
+    def sort_key(self, index: QModelIndex):
+        """
+        Get the data of index used for comparison.
+
+        The value returned by `choose_data` is cached until the
+        source model changes.
+        """
+        column = index.column()
+        keys = self._sort_keys.get(column)
+        if keys is None:
+            keys = self._sort_keys[column] = {}
+
+        internal_id = index.internalId()
+        try:
+            return keys[internal_id]
+        except KeyError:
+            key = keys[internal_id] = self.choose_data(index)
+            return key
+
     def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
         """
         Return whether the item of `left` is lower than the one of `right`.
@@ -981,16 +1199,15 @@ def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
             Whether left is lower than right.
         """
         if self.folders_on_top:
-            item1 = left.internalPointer()
-            item2 = right.internalPointer()
-            ch1 = bool(len(item1.children))
-            ch2 = bool(len(item2.children))
+            # an item is a folder if it has children
+            ch1 = bool(left.internalPointer().children)
+            ch2 = bool(right.internalPointer().children)
 
-            if ch1 ^ ch2:
+            if ch1 is not ch2:
                 if self.sortOrder() == Qt.SortOrder.AscendingOrder:
                     return ch1
                 return ch2
 
-        data1 = self.choose_data(left)
-        data2 = self.choose_data(right)
+        data1 = self.sort_key(left)
+        data2 = self.sort_key(right)
         return data1 < data2
@@ -11,10 +11,13 @@
     ChangeType,
     DiffData,
     DiffResultDialog,
+    DiffSortProxyModel,
     DiffTree,
     FileType,
+    iter_json_lines,
     parse_diff_json,
     parse_diff_lines,
+    shared_tuple,
 )
 from vorta.views.partials.treemodel import FileTreeModel
 
@@ -117,6 +120,21 @@ def test_treeview_context_menu(qapp, qtbot, mocker, borg_json_output, archive_en
             'changed link        some/changed/link',
             ('some/changed/link', FileType.LINK, ChangeType.CHANGED_LINK, 0, 0, None, None, None, None, None),
         ),
+        (
+            'changed link [theuser:dip -> theuser:theuser] some/changed/link',
+            (
+                'some/changed/link',
+                FileType.LINK,
+                ChangeType.CHANGED_LINK,
+                0,
+                0,
+                None,
+                ('theuser', 'dip', 'theuser', 'theuser'),
+                None,
+                None,
+                None,
+            ),
+        ),
         (
             ' +77.8 kB  -77.8 kB some/changed/file',
             (
@@ -170,6 +188,14 @@ def test_treeview_context_menu(qapp, qtbot, mocker, borg_json_output, archive_en
             'removed directory  some/changed/dir',
             ('some/changed/dir', FileType.DIRECTORY, ChangeType.REMOVED_DIR, 0, 0, None, None, None, None, None),
         ),
+        (
+            'added link         some/changed/link',
+            ('some/changed/link', FileType.LINK, ChangeType.ADDED, 0, 0, None, None, None, None, None),
+        ),
+        (
+            'removed fifo       some/changed/fifo',
+            ('some/changed/fifo', FileType.FIFO, ChangeType.REMOVED, 0, 0, None, None, None, None, None),
+        ),
         # Example from https://github.com/borgbase/vorta/issues/521
         (
             '[user:user -> nfsnobody:nfsnobody] home/user/arrays/test.txt',
@@ -403,6 +429,10 @@ def test_archive_diff_parser(line, expected):
                 None,
             ),
         ),
+        (
+            {'path': 'home/user/pipe', 'changes': [{'type': 'added fifo', 'size': 0}]},
+            ('home/user/pipe', FileType.FIFO, ChangeType.ADDED, 0, 0, None, None, None, None, None),
+        ),
         # All file-related changes in one test
         (
             {
@@ -462,6 +492,50 @@ def test_archive_diff_json_parser(line, expected):
     assert item.data == DiffData(*expected[1:])
 
 
+def test_diff_sort_proxy():
+    model = DiffTree()
+    model.setMode(model.DisplayMode.FLAT)
+    parse_diff_lines(['added          20 B a', 'added          10 B b'], model)
+
+    proxy = DiffSortProxyModel()
+    proxy.setSourceModel(model)
+    proxy.sort(3, Qt.SortOrder.AscendingOrder)
+
+    def sorted_paths():
+        return [proxy.mapToSource(proxy.index(row, 0)).internalPointer().path for row in range(proxy.rowCount())]
+
+    assert sorted_paths() == [('b',), ('a',)]
+
+    # changing the data must invalidate the cached sort keys
+    index = model.indexPath(('a',))
+    index.internalPointer().data.size = 5
+    model.dataChanged.emit(index, model.index(index.row(), 3))
+    assert sorted_paths() == [('a',), ('b',)]
+
+    parse_diff_lines(['removed          30 B c'], model)
+    assert sorted_paths() == [('c',), ('a',), ('b',)]
+
+
+def test_iter_json_lines():
+    fs_data = '{"path": "a", "changes": []}\n\n{"path": "b", "changes": [{"type": "mode"}]}\n'
+
+    assert list(iter_json_lines(fs_data)) == [
+        {'path': 'a', 'changes': []},
+        {'path': 'b', 'changes': [{'type': 'mode'}]},
+    ]
+    assert list(iter_json_lines('')) == []
+
+
+def test_shared_tuple():
+    cache = {}
+    first = shared_tuple(cache, ('user', 'user', 'nfsnobody', 'nfsnobody'))
+    second = shared_tuple(cache, tuple('user user nfsnobody nfsnobody'.split()))
+
+    assert first == ('user', 'user', 'nfsnobody', 'nfsnobody')
+    assert second is first
+    assert shared_tuple(cache, ('-rw-rw-rw-', '-rw-r--r--')) is not first
+
+
 @pytest.mark.parametrize(
     "selection, expected_mode, expected_bCollapseAllEnabled",
     [
@@ -2,7 +2,7 @@
 
 import pytest
 from PyQt6.QtCore import QModelIndex
-from vorta.views.partials.treemodel import FileSystemItem, FileTreeModel
+from vorta.views.partials.treemodel import FileSystemItem, FileTreeModel, path_to_str, str_to_path
 
 
 class TreeModelImp(FileTreeModel):
@@ -68,6 +68,8 @@ def test_remove(self):
         item.remove(child3)
         assert len(item.children) == 1
         assert child3 not in item.children
+        assert list(item.child_map) == ['a']
+        assert item._subpaths == [c.subpath for c in item.children]
 
         # test remove item not present
         child = FileSystemItem(PurePath('notpresent').parts, 2)
@@ -103,6 +105,30 @@ def test_get(self):
         # get subpath of empty list
         assert child1.get('a') is None
 
+        # get child without index
+        assert item.get_child('c') is child3
+        assert item.get_child('unknown') is None
+
+    def test_row(self):
+        item = FileSystemItem(('test',), 0)
+        child_b = FileSystemItem(('test', 'b'), 1)
+        child_d = FileSystemItem(('test', 'd'), 2)
+
+        item.add(child_d)
+        item.add(child_b)
+        assert child_b.row() == 0
+        assert child_d.row() == 1
+
+        # the cached row is updated when siblings are inserted before an item
+        item.add(FileSystemItem(('test', 'a'), 3))
+        item.add(FileSystemItem(('test', 'c'), 4))
+        assert child_b.row() == 1
+        assert child_d.row() == 3
+
+        item.remove('a')
+        assert child_b.row() == 0
+        assert child_d.row() == 2
+
     def test_get_subpath(self):
         item = FileSystemItem(('test',), 0)
         child1 = FileSystemItem(PurePath('test/a').parts, 4)
@@ -171,6 +197,8 @@ def test_basic_setup(self):
         index2 = model.index(0, 0, index1)
         assert index2.internalPointer() == item2
         assert index2 == model.indexPath(PurePath('test/subtest'))
+        assert model.indexPath(PurePath('test/unknown')) == QModelIndex()
+        assert model.indexPath(PurePath('unknown/subtest')) == QModelIndex()
 
         # test rowCount
         assert model.rowCount() == 2
@@ -187,6 +215,58 @@ def test_basic_setup(self):
         item3 = model.getItem(PurePath('/hello'))
         assert len(item3.children) == 0
 
+    def test_add_items_single_reset(self):
+        model = TreeModelImp()
+        resets = []
+        model.modelReset.connect(lambda: resets.append(True))
+
+        model.addItems((PurePath(p), i) for i, p in enumerate(['a', 'a/b', 'a/b/c', 'b']))
+
+        assert len(resets) == 1
+        assert model.rowCount() == 2
+        assert model.getItem(PurePath('a/b/c')).data == 2
+
+    def test_add_items_shared_parent(self):
+        model = TreeModelImp()
+        paths = ['a/b/c', 'a/b/d', 'a/e', 'a/b/f', 'g', 'a/b/h']
+
+        model.addItems((PurePath(p), i) for i, p in enumerate(paths))
+
+        for i, p in enumerate(paths):
+            assert model.getItem(PurePath(p)).data == i
+        assert [c.subpath for c in model.getItem(PurePath('a/b')).children] == ['c', 'd', 'f', 'h']
+        assert model.rowCount() == 2
+
+    def test_add_items_unsorted(self):
+        model = TreeModelImp()
+        paths = ['b/z', 'b/a', 'a', 'b/m/x', 'b/c']
+        model.addItems((PurePath(p), i) for i, p in enumerate(paths))
+
+        b = model.getItem(PurePath('b'))
+        assert [c.subpath for c in model.root.children] == ['a', 'b']
+        assert [c.subpath for c in b.children] == ['a', 'c', 'm', 'z']
+        assert b._subpaths == ['a', 'c', 'm', 'z']
+        assert [c.row() for c in b.children] == [0, 1, 2, 3]
+        assert [path_to_str(item.path) for item in model._flattened] == ['a', 'b', 'b/a', 'b/c', 'b/m', 'b/m/x', 'b/z']
+        assert model._flat_paths == [item.path for item in model._flattened]
+
+        # single items are still inserted sorted
+        model.addItem((PurePath('b/b'), 5))
+        assert b._subpaths == ['a', 'b', 'c', 'm', 'z']
+        assert model._flat_paths == sorted(model._flat_paths)
+
+    def test_flat_remove_subtree(self):
+        model = TreeModelImp()
+        model.setMode(model.DisplayMode.FLAT)
+        paths = ['x', 'x/y', 'x/y/z', 'x/y2', 'x/y2/z', 'w', 'xa']
+        model.addItems((PurePath(p), i) for i, p in enumerate(paths))
+
+        model.removeItem(PurePath('x/y'))
+        model.removeItem(PurePath('x/unknown'))
+
+        assert [path_to_str(item.path) for item in model._flattened] == ['w', 'x', 'x/y2', 'x/y2/z', 'xa']
+        assert model._flat_paths == [item.path for item in model._flattened]
+
     def test_empty_path(self):
         model = TreeModelImp()
         assert model.rowCount() == 0
@@ -239,6 +319,7 @@ def test_flat(self):
 
         assert model.rowCount() == len(items)
         assert item not in model._flattened
+        assert model._flat_paths == [item.path for item in model._flattened]
 
         # test flat indexPath
         index = model.indexPath(PurePath('a/b'))
@@ -348,3 +429,11 @@ def test_simplified_tree(self):
         model.setMode(model.DisplayMode.TREE)
 
         assert model.rowCount() == 3
+
+
+@pytest.mark.parametrize(
+    'path',
+    ['test', 'test/hello', 'test/hello/', './test//hello', 'some file/with spaces.txt', '.', ''],
+)
+def test_str_to_path(path):
+    assert str_to_path(path) == PurePath(path).parts